@@ -1,14 +1,29 @@
 import streamlit as st
 
-from src.io import load_sample_dataset
-from src_plots import plot_median_price_by_district, plot_price_histogram
+from src.io import ensure_preview_available, load_columns
+from src.plots import plot_median_price_by_district, plot_price_histogram
 
 def render_eda_page() -> None:
 	"""Render minial but meaningful EDA charts for the sample dataset."""
 	st.title("EDA (Exploratory Data Analysis)")
 
+	# First paint uses the small preview file; the full sample loads on request.
+	# on_click runs before the rerun, so the button is gone once clicked.
+	full = st.session_state.get("eda_full_sample", False) or not ensure_preview_available()
+	if not full:
+		st.button(
+			"Load full sample (100k rows)",
+			on_click=lambda: st.session_state.update(eda_full_sample=True),
+		)
+
+	df = load_columns(("price_10k_krw", "district"), preview=not full)
+	st.caption(f"Rows: {len(df):,}")
+
+	st.plotly_chart(plot_price_histogram(df))
+	st.plotly_chart(plot_median_price_by_district(df))
+
 def main() -> None:
 	"""Entry point for this page."""
 	render_eda_page()
 
-main()
\ No newline at end of file
+main()
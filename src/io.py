@@ -1,13 +1,161 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import streamlit as st
 
-@st.cache_data
-def load_sample_dataset(path: str = "data/sample.parquet") -> pd.DataFrame:
+# Rows in sample_preview.parquet: enough for a rough histogram on first paint
+PREVIEW_ROWS = 5_000
+
+def _is_fresh(derived: Path, source: Path) -> bool:
+	"""True if `derived` exists and is not older than `source`."""
+	return derived.exists() and derived.stat().st_mtime >= source.stat().st_mtime
+
+def _write_atomically(dest: Path, write: Callable[[str], None]) -> bool:
+	"""
+	Run `write(tmp_path)` on a unique temp file next to `dest`, then swap it in.
+
+	Why?
+	- Each process writes its own temp file and os.replace() swaps it in
+	  atomically, so processes starting together never read a half-written file.
+	- Returns False when the file cannot be written (e.g. read-only disk).
+	"""
+	tmp_path = None
+	try:
+		with tempfile.NamedTemporaryFile(
+			dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp", delete=False,
+		) as tmp:
+			tmp_path = Path(tmp.name)
+		write(str(tmp_path))
+		os.chmod(tmp_path, 0o644)  # NamedTemporaryFile creates 0600 files
+		os.replace(tmp_path, dest)
+	except OSError:
+		if tmp_path is not None:
+			tmp_path.unlink(missing_ok=True)
+		return False
+	return True
+
+def _ensure_feather(path: str) -> Path | None:
+	"""
+	Return the Feather copy of a Parquet file, (re)writing it if missing or stale.
+
+	Why?
+	- Git keeps only the small Parquet file; the uncompressed Feather copy
+	  is rebuilt once per container start instead of being committed.
+	- A copy older than the Parquet file (e.g. after a `git pull`) is rebuilt.
+	- Returns None when the copy cannot be written.
 	"""
-	Load the lightweight sample dataset stored as Parquet.
+	feather_path = Path(path).with_suffix(".feather")
+	if _is_fresh(feather_path, Path(path)):
+		return feather_path
+	written = _write_atomically(
+		feather_path,
+		lambda tmp: feather.write_feather(pq.read_table(path), tmp, compression="uncompressed"),
+	)
+	return feather_path if written else None
+
+def _preview_table(table: pa.Table, rows: int = PREVIEW_ROWS, seed: int = 0) -> pa.Table:
+	"""
+	Take a seeded sample-of-sample for the first paint of the app.
+
+	Rows keep their original order, so the (year, district) clustering of
+	the full sample carries over.
+	"""
+	rng = np.random.default_rng(seed)
+	positions = np.sort(rng.choice(table.num_rows, size=min(rows, table.num_rows), replace=False))
+	return table.take(pa.array(positions))
+
+def _ensure_preview(path: str) -> Path | None:
+	"""
+	Return sample_preview.parquet next to `path`, deriving it if missing or stale.
+
+	This is the only writer of the preview: a seeded PREVIEW_ROWS subsample
+	of the full sample (see _preview_table), so it never needs the raw CSV.
+	Returns None when it cannot be written.
+	"""
+	p = Path(path)
+	preview_path = p.with_name(f"{p.stem}_preview{p.suffix}")
+	if _is_fresh(preview_path, p):
+		return preview_path
+	written = _write_atomically(
+		preview_path,
+		lambda tmp: pq.write_table(_preview_table(_load_table(path)), tmp, compression="zstd"),
+	)
+	return preview_path if written else None
+
+@st.cache_resource
+def _load_table(path: str) -> pa.Table:
+	"""
+	Load the sample as a memory-mapped Arrow table.
+
+	Why memory-map?
+	- Uncompressed Arrow IPC (Feather V2) is laid out for direct use: the
+	  columns are served from the OS page cache, shared by every session
+	  and process, with no decode/decompress step like Parquet.
+	- cache_resource keeps one immutable table shared across sessions
+	  (Arrow tables are immutable, so sharing is safe).
+	"""
+	feather_path = _ensure_feather(path)
+	if feather_path is None:
+		return pq.read_table(path)
+	return pa.ipc.open_file(pa.memory_map(str(feather_path), "r")).read_all()
+
+def ensure_preview_available(path: str = "data/sample.parquet") -> bool:
+	"""
+	Make sure sample_preview.parquet exists next to `path`; True if it does.
+
+	Side effect:
+	    Writes sample_preview.parquet (and, once loaded, its Feather copy)
+	    when it is missing or older than `path`. Returns False only when
+	    the file cannot be written.
+	"""
+	return _ensure_preview(path) is not None
+
+def _resolve_path(path: str, preview: bool) -> str:
+	"""
+	Return the preview sibling of `path` (sample_preview.parquet) when asked
+	for and available; otherwise `path` itself.
+	"""
+	preview_path = _ensure_preview(path) if preview else None
+	return str(preview_path) if preview_path is not None else path
+
+def load_sample_dataset(path: str = "data/sample.parquet", preview: bool = False) -> pd.DataFrame:
+	"""
+	Load the lightweight sample dataset (memory-mapped Feather copy of the Parquet).
+
+	Why no cache_data here?
+	- cache_data pickles a copy of the DataFrame for every session.
+	- The Arrow table is already cached once via cache_resource; building
+	  the pandas view from it is cheap.
+
+	preview=True loads the ~5k-row sample_preview.parquet instead (derived
+	from the full sample if missing; falls back to the full sample if it
+	cannot be written).
+	"""
+	return _load_table(_resolve_path(path, preview)).to_pandas(split_blocks=True)
+
+def load_columns(
+	cols: tuple[str, ...],
+	path: str = "data/sample.parquet",
+	preview: bool = False,
+) -> pd.DataFrame:
+	"""
+	Load only the given columns of the sample dataset.
+
+	Example:
+	    load_columns(("price_10k_krw", "district"), preview=True)
 
-	Why caching?
-	- Streamlit reruns scripts on UI interactions.
-	- Caching prevents re-reading the same file repeatedly.
+	Why?
+	- Charts usually need 1-2 columns; selecting on the Arrow table avoids
+	  building the full DataFrame just to plot one histogram.
 	"""
-	return pd.read_parquet(path)
\ No newline at end of file
+	table = _load_table(_resolve_path(path, preview))
+	return table.select(list(cols)).to_pandas(split_blocks=True)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 
@@ -8,17 +9,22 @@ def ensure_district_column(df: pd.DataFrame) -> pd.DataFrame:
 	Expected format example:
 	- sigungu: "서울특별시 강남구 개포동"
 	- district: "강남구"
+
+	Only the new column is allocated (assign, not copy); existing columns
+	are shared with `df`, so do not mutate them in place.
 	"""
 	if "district" in df.columns:
 		return df
 	
-	out = df.copy()
-	if "singungu" not in out.columns:
-		out["district"] = "Unknown"
-		return out
+	if "sigungu" not in df.columns:
+		return df.assign(district="Unknown")
 	
-	out["district"] = out["singungu"].astype(str).str.split().str[1].fillna("Unknown")
-	return out
+	district = (
+		df["sigungu"].astype("string[pyarrow]")
+		.str.extract(r"^\s*\S+\s+(\S+)", expand=False)
+		.fillna("Unknown")
+	)
+	return df.assign(district=district)
 
 def plot_price_histogram(df: pd.DataFrame):
 	"""
@@ -27,13 +33,25 @@ def plot_price_histogram(df: pd.DataFrame):
 	This helps check:
 	- overall skewness
 	- tails / extreme values
+
+	Bins are counted here (60 buckets) so only the bin table is sent to
+	the browser, not every transaction row.
 	"""
-	return px.histogram(
-		df,
+	prices = df["price_10k_krw"].dropna().to_numpy()
+	counts, edges = np.histogram(prices, bins=60)
+	bins = pd.DataFrame({
+		"price_10k_krw": (edges[:-1] + edges[1:]) / 2,
+		"count": counts,
+	})
+	fig = px.bar(
+		bins,
 		x="price_10k_krw",
-		nbins=60,
+		y="count",
 		title="Transaction Price Distribution (10,000 KRW unit)",
 	)
+	fig.update_traces(width=edges[1] - edges[0])
+	fig.update_layout(bargap=0)
+	return fig
 
 def plot_median_price_by_district(df: pd.DataFrame):
 	"""
@@ -44,7 +62,8 @@ def plot_median_price_by_district(df: pd.DataFrame):
 	"""
 	df2 = ensure_district_column(df)
 	g = (
-		df2.groupby("district", as_index=False)["price_10k_krw"]
+		df2[["district", "price_10k_krw"]]
+		.groupby("district", as_index=False, sort=False, observed=True)["price_10k_krw"]
 		.median()
 		.sort_values("price_10k_krw", ascending=False)
 	)
@@ -11,6 +11,7 @@ Test Coverage:
 """
 
 import pandas as pd
+import pyarrow.csv as pv
 from pathlib import Path
 
 def test_sampling_output():
@@ -25,7 +26,12 @@ def test_sampling_output():
     sample_path = "data/sample.parquet"
     
     print(f"\n[1] Loading original data: {original_path}")
-    df_original = pd.read_csv(original_path, low_memory=False)
+    # Only the columns compared below (district, year, price) are parsed
+    table = pv.read_csv(
+        original_path,
+        convert_options=pv.ConvertOptions(include_columns=["시군구", "계약년월", "target"]),
+    )
+    df_original = table.to_pandas()
     print(f"    ✓ Original rows: {len(df_original):,}")
     
     print(f"\n[2] Loading sample data: {sample_path}")